@@ -3,28 +3,54 @@
 Minimal, colorful, bold Tkinter UI for Music Bingo.
 
 This intentionally small app centers the controls, uses large bold labels,
-and keeps behavior identical to the CLI runner. It runs the export and bingo
-commands in a background thread so the UI stays responsive.
+and keeps behavior identical to the CLI runner. It calls the export and bingo entry
+points in-process on a background thread so the UI stays responsive.
 
 Run: python desktop_app.py
 """
 
+import contextlib
+import io
+import re
 import threading
-import subprocess
-import sys
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 import webbrowser
 
-HERE = Path(__file__).resolve().parent
-EXPORT_SCRIPT = HERE / "export_playlist_to_csv.py"
-BINGO_SCRIPT = HERE / "make_bingo_from_csv.py"
+from export_playlist_to_csv import run_export
+from make_bingo_from_csv import run_bingo
+
+# runs of anything other than letters, digits, "-", "_" or "."
+_SANITIZE = re.compile(r"[^\w.-]+")
+
+
+class _LineRelay(io.StringIO):
+    """StringIO that also hands each completed line to a callback as it is written."""
+
+    def __init__(self, on_line):
+        super().__init__()
+        self._on_line = on_line
+        self._partial = ""
+
+    def write(self, s):
+        self._partial += s
+        *lines, self._partial = self._partial.split("\n")
+        for line in lines:
+            if line.strip():
+                self._on_line(line.rstrip())
+        return super().write(s)
+
+    def flush(self):
+        # hand over a trailing line that never got its newline
+        if self._partial.strip():
+            self._on_line(self._partial.rstrip())
+        self._partial = ""
+        super().flush()
 
 
 def to_filename(name: str, ext: str) -> str:
-    base = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name.strip())
-    base = base.strip("_") or "output"
+    base = _SANITIZE.sub("_", name.strip()).strip("_") or "output"
     if not base.lower().endswith(f".{ext.lower()}"):
         base += f".{ext}"
     return base
@@ -67,8 +93,8 @@ class SimpleApp(tk.Tk):
         self.no_repeat_var = tk.BooleanVar(value=False)
         tk.Checkbutton(container, variable=self.no_repeat_var, bg="#212121", fg="#535353", activebackground="#0E0E0E", highlightthickness=0).grid(row=4, column=1, sticky=tk.W, pady=(8,0))
 
-        run_btn = tk.Button(container, text="Run", bg=accent, fg="#212121", font=btn_font, activebackground=accent, command=self.on_run, width=12, bd=0)
-        run_btn.grid(row=5, column=0, columnspan=2, pady=(12,0))
+        self.run_btn = tk.Button(container, text="Run", bg=accent, fg="#212121", font=btn_font, activebackground=accent, command=self.on_run, width=12, bd=0)
+        self.run_btn.grid(row=5, column=0, columnspan=2, pady=(12,0))
         status_lbl = tk.Label(container, textvariable=self.status_var, fg="white", bg="#212121", font=label_font)
         status_lbl.grid(row=6, column=0, columnspan=2, pady=(12,0))
 
@@ -84,16 +110,55 @@ class SimpleApp(tk.Tk):
         csv_out = f"csv_files/{to_filename(playlist.replace(' ', '_'), 'csv')}"
         pdf_out = f"quiz_pdfs/{to_filename(playlist.replace(' ', '_') + '_bingo', 'pdf')}"
 
-        t = threading.Thread(target=self._work, args=(playlist, csv_out, pdf_out), daemon=True)
+        try:
+            n_cards = self.n_var.get()
+        except tk.TclError:
+            messagebox.showerror("Invalid", "Cards must be a whole number")
+            return
+        # read Tk variables here; the worker thread must not touch widgets
+        bingo_opts = {
+            "n": n_cards,
+            "title": self.title_var.get().strip() or None,
+            "no_repeat_across": self.no_repeat_var.get(),
+        }
+
+        # one run at a time: steps share sys.stdout/stderr redirection and output paths
+        self.run_btn.config(state=tk.DISABLED)
+        t = threading.Thread(target=self._work, args=(playlist, csv_out, pdf_out, bingo_opts), daemon=True)
         t.start()
 
-    def _work(self, playlist, csv_out, pdf_out):
+    def _run_step(self, func, **kwargs):
+        """Call an export/bingo entry point, returning its captured output on failure (None on success).
+
+        Output lines are relayed to the status label as they are printed.
+        """
+        buf = _LineRelay(lambda line: self.after(0, self.set_status, line))
+        try:
+            with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+                func(**kwargs)
+        except SystemExit as e:
+            if e.code in (None, 0):
+                return None
+            reason = f"exited with status {e.code}" if isinstance(e.code, int) else str(e.code)
+            return (buf.getvalue() + "\n" + reason).strip()
+        except Exception as e:
+            return (buf.getvalue() + "\n" + (str(e) or type(e).__name__)).strip()
+        finally:
+            buf.flush()
+        return None
+
+    def _work(self, playlist, csv_out, pdf_out, bingo_opts):
         try:
             self.after(0, lambda: self.set_status("Exporting..."))
-            cmd1 = [sys.executable, str(EXPORT_SCRIPT), "--name", playlist, "--out", csv_out]
-            p1 = subprocess.run(cmd1, capture_output=True, text=True)
-            if p1.returncode != 0:
-                self.after(0, lambda: messagebox.showerror("Export failed", p1.stderr or p1.stdout))
+            err = self._run_step(run_export, name=playlist, out=csv_out)
+            if err is not None:
+                self.after(0, lambda: messagebox.showerror("Export failed", err))
+                return
+
+            self.after(0, lambda: self.set_status("Generating bingo cards..."))
+            err = self._run_step(run_bingo, csv_path=csv_out, out=pdf_out, **bingo_opts)
+            if err is not None:
+                self.after(0, lambda: messagebox.showerror("Bingo failed", err))
                 return
             # open the generated PDF in the default application / browser
             try:
@@ -101,20 +166,13 @@ class SimpleApp(tk.Tk):
             except Exception:
                 # fallback: show path in messagebox
                 self.after(0, lambda: messagebox.showinfo("Done", f"CSV: {csv_out}\nPDF: {pdf_out}"))
-            if self.title_var.get().strip():
-                cmd2 += ["--title", self.title_var.get().strip()]
-            if self.no_repeat_var.get():
-                cmd2 += ["--no-repeat-across"]
-            p2 = subprocess.run(cmd2, capture_output=True, text=True)
-            if p2.returncode != 0:
-                self.after(0, lambda: messagebox.showerror("Bingo failed", p2.stderr or p2.stdout))
-                return
             self.after(0, lambda: self.set_status("Done"))
             self.after(0, lambda: messagebox.showinfo("Done", f"COMPLETED\nPDF located at: {pdf_out}"))
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror("Error", str(e)))
+            self.after(0, lambda msg=str(e): messagebox.showerror("Error", msg))
         finally:
             self.after(0, lambda: self.set_status("Ready"))
+            self.after(0, lambda: self.run_btn.config(state=tk.NORMAL))
 
 
 def main():
@@ -1,24 +1,56 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import json
 import os
 import re
-from typing import Iterable, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 from unidecode import unidecode
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 
-SCOPES = ["playlist-read-private", "playlist-read-collaborative"]
+if TYPE_CHECKING:
+    # spotipy is imported where it's used so --help and argument errors return instantly
+    import spotipy
+
+SCOPE_STR = "playlist-read-private playlist-read-collaborative"
+CACHE_PATH = ".cache"  # spotipy's token cache
+META_PATH = CACHE_PATH + "-meta.json"  # user_id and name -> playlist_id lookups for that token
+_PL_URL_RE = re.compile(r"(?:open\.spotify\.com/playlist/|spotify:playlist:)([A-Za-z0-9]{22})")
+_PL_ID_RE = re.compile(r"[A-Za-z0-9]{22}")
+PAGE_WORKERS = 8  # concurrent playlist_items requests once the total is known
+
+_thread_local = threading.local()
 
 def norm(s: str) -> str:
-    return unidecode((s or "").strip())
+    s = (s or "").strip()
+    # most Spotify metadata is already ASCII, and unidecode would return it unchanged
+    return s if s.isascii() else unidecode(s)
 
 def artists_str(artists: List[dict]) -> str:
     return ", ".join(norm(a.get("name","")) for a in (artists or []) if a and a.get("name"))
 
-def parse_args():
+def load_meta() -> dict:
+    # Only trust the metadata while the token it was recorded with is still cached
+    if not os.path.exists(CACHE_PATH):
+        return {}
+    try:
+        with open(META_PATH, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+def save_meta(meta: dict):
+    try:
+        with open(META_PATH, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass  # purely an optimisation; next run just does the lookups again
+
+def parse_args(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser(description="Export a Spotify playlist you can access to CSV.")
     src = ap.add_mutually_exclusive_group(required=True)
     src.add_argument("--playlist", help="Playlist URL/URI/ID to export.")
@@ -27,21 +59,22 @@ def parse_args():
     ap.add_argument("--out", default="playlist_tracks.csv", help="Output CSV path (default: playlist_tracks.csv)")
     ap.add_argument("--market", default=None, help="Market code (e.g., GB, US) for track metadata bias.")
     ap.add_argument("--include-local", action="store_true", help="Include local/unavailable tracks (off by default).")
-    return ap.parse_args()
+    return ap.parse_args(argv)
 
 def extract_playlist_id(s: str) -> str:
     s = s.strip()
     # Support URL, URI, or raw ID
-    m = re.search(r"(?:open\.spotify\.com/playlist/|spotify:playlist:)([A-Za-z0-9]{22})", s)
+    m = _PL_URL_RE.search(s)
     if m:
         return m.group(1)
     # if looks like an ID
-    if re.fullmatch(r"[A-Za-z0-9]{22}", s):
+    if _PL_ID_RE.fullmatch(s):
         return s
     return s  # let API error if malformed
 
-def find_playlist_by_name(sp: spotipy.Spotify, user_id: str, target: str) -> Optional[dict]:
+def find_playlist_by_name(sp: "spotipy.Spotify", user_id: str, target: str) -> Optional[dict]:
     target_n = norm(target).lower()
+    t_words = set(target_n.split())
     best = None
     best_score = -1
 
@@ -52,16 +85,16 @@ def find_playlist_by_name(sp: spotipy.Spotify, user_id: str, target: str) -> Opt
         items = page.get("items", []) or []
         for pl in items:
             name = norm(pl.get("name",""))
+            name_l = name.lower()
             score = 0
-            if name.lower() == target_n:
-                score = 100
-            elif target_n in name.lower():
+            if name_l == target_n:
+                # exact match can't be beaten; skip the remaining pages
+                return pl
+            elif target_n in name_l:
                 score = 80 - abs(len(name) - len(target))
             else:
                 # simple overlap score
-                t_words = set(target_n.split())
-                n_words = set(name.lower().split())
-                score = len(t_words & n_words)
+                score = sum(1 for w in set(name_l.split()) if w in t_words)
             if score > best_score:
                 best_score = score
                 best = pl
@@ -70,23 +103,52 @@ def find_playlist_by_name(sp: spotipy.Spotify, user_id: str, target: str) -> Opt
         offset += limit
     return best
 
-def iter_playlist_tracks(sp: spotipy.Spotify, playlist_id: str, market: Optional[str], include_local: bool):
+def _spotify_for_thread(sp: "spotipy.Spotify") -> "spotipy.Spotify":
+    # Each worker gets its own client (and HTTP session). They still share the caller's
+    # auth manager, whose refresh/cache write isn't thread-safe, so iter_playlist_tracks
+    # refreshes the token on the calling thread before the pool starts; workers then
+    # only read the already-valid cached token.
+    client = getattr(_thread_local, "sp", None)
+    if client is None:
+        import spotipy
+        client = spotipy.Spotify(auth_manager=sp.auth_manager)
+        _thread_local.sp = client
+    return client
+
+def iter_playlist_tracks(sp: "spotipy.Spotify", playlist_id: str, market: Optional[str], include_local: bool):
     """
     Yield rows (position,title,artists,album,added_at,duration_ms,isrc,spotify_url)
+
+    The first page reveals the playlist size; the remaining pages are fetched
+    concurrently and yielded back in playlist order.
     """
     limit = 100
-    offset = 0
-    pos = 0
-    while True:
-        page = sp.playlist_items(
+
+    def fetch(client: "spotipy.Spotify", offset: int) -> dict:
+        return client.playlist_items(
             playlist_id,
             market=market,
             limit=limit,
             offset=offset,
             additional_types=("track",),
             fields="items(added_at,track(is_local,available_markets,name,uri,external_urls.spotify,"
-                   "duration_ms,external_ids.isrc,artists(name),album(name))),next"
+                   "duration_ms,external_ids.isrc,artists(name),album(name))),next,total"
         )
+
+    def pages() -> Iterator[dict]:
+        first = fetch(sp, 0)
+        yield first
+        if not first.get("next"):
+            return
+        offsets = range(limit, first.get("total", 0), limit)
+        # refresh here, single-threaded, if the token is close to expiry
+        sp.auth_manager.get_access_token(as_dict=False)
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            # map() keeps submission order, so positions stay stable
+            yield from pool.map(lambda o: fetch(_spotify_for_thread(sp), o), offsets)
+
+    pos = 0
+    for page in pages():
         items = page.get("items", []) or []
         for it in items:
             tr = it.get("track")
@@ -105,49 +167,85 @@ def iter_playlist_tracks(sp: spotipy.Spotify, playlist_id: str, market: Optional
 
             pos += 1
             yield (pos, title, artists, album, added_at, duration_ms, isrc, url)
-        if not page.get("next"):
-            break
-        offset += limit
 
-def main():
+def run_export(playlist: Optional[str] = None, name: Optional[str] = None, out: str = "playlist_tracks.csv",
+               market: Optional[str] = None, include_local: bool = False) -> int:
+    """
+    Export a playlist (by URL/URI/ID or best-matching name) to CSV. Returns the number of tracks written.
+    """
+    import spotipy
+    from spotipy.cache_handler import CacheFileHandler
+    from spotipy.oauth2 import SpotifyOAuth
+
     load_dotenv()  # SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET, SPOTIPY_REDIRECT_URI
-    args = parse_args()
 
-    auth = SpotifyOAuth(scope=" ".join(SCOPES))
+    auth = SpotifyOAuth(scope=SCOPE_STR, cache_handler=CacheFileHandler(cache_path=CACHE_PATH))
     sp = spotipy.Spotify(auth_manager=auth)
 
-    me = sp.me()
-    user_id = me["id"]
+    meta = load_meta()
+    user_id = meta.get("user_id")
+    if not user_id:
+        me = sp.me()
+        user_id = me["id"]
+        meta["user_id"] = user_id
 
-    if args.playlist:
-        playlist_id = extract_playlist_id(args.playlist)
+    if playlist:
+        playlist_id = extract_playlist_id(playlist)
         pl = sp.playlist(playlist_id, fields="name,id")
     else:
-        pl = find_playlist_by_name(sp, user_id, args.name)
+        # Only exact name matches are cached, so a fuzzy pick never shadows a
+        # playlist created later under the typed name
+        name_to_id = meta.setdefault("name_to_id", {})
+        name_n = norm(name).lower()
+        pl = None
+        if name in name_to_id:
+            try:
+                pl = sp.playlist(name_to_id[name], fields="name,id")
+            except spotipy.SpotifyException:
+                pl = None  # deleted or no longer accessible; search again
+            if pl and norm(pl.get("name","")).lower() != name_n:
+                pl = None  # renamed since it was cached
+            if not pl:
+                del name_to_id[name]
         if not pl:
-            raise SystemExit(f"Could not find a playlist matching name: {args.name!r}")
+            pl = find_playlist_by_name(sp, user_id, name)
+        if not pl:
+            raise SystemExit(f"Could not find a playlist matching name: {name!r}")
         playlist_id = pl["id"]
+        if norm(pl.get("name","")).lower() == name_n:
+            name_to_id[name] = playlist_id
 
     pl_name = pl.get("name","")
-    rows = list(iter_playlist_tracks(sp, playlist_id, args.market, args.include_local))
-
-    # Deduplicate exact duplicates by (title, artists, album, url)
-    seen = set()
-    deduped = []
-    for (position, title, artists, album, added_at, duration_ms, isrc, url) in rows:
-        key = (title, artists, album, url)
-        if key not in seen:
+
+    # Stream rows straight to disk, dropping exact duplicates. A track's URL already
+    # determines its title/artists/album, so it's the whole key; local tracks have no
+    # URL and fall back to (title, artists, album).
+    seen: set[Union[str, Tuple[str, str, str]]] = set()
+
+    def unique_rows():
+        for (position, title, artists, album, added_at, duration_ms, isrc, url) in iter_playlist_tracks(sp, playlist_id, market, include_local):
+            key = url or (title, artists, album)
+            if key in seen:
+                continue
             seen.add(key)
-            deduped.append((position, title, artists, album, added_at, duration_ms, isrc, url))
+            yield (position, title, artists, album, added_at, duration_ms, isrc, url, pl_name, playlist_id)
 
-    out_path = args.out
-    with open(out_path, "w", encoding="utf-8", newline="") as f:
+    out_path = out
+    with open(out_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
         w = csv.writer(f)
         w.writerow(["position","title","artists","album","added_at","duration_ms","isrc","spotify_url","playlist_name","playlist_id"])
-        for (position, title, artists, album, added_at, duration_ms, isrc, url) in deduped:
-            w.writerow([position, title, artists, album, added_at, duration_ms, isrc, url, pl_name, playlist_id])
-
-    print(f"Wrote {len(deduped)} tracks to {out_path}")
+        w.writerows(unique_rows())
+
+    # every unique key was written exactly once
+    written = len(seen)
+    save_meta(meta)
+    print(f"Wrote {written} tracks to {out_path}")
+    return written
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    run_export(playlist=args.playlist, name=args.name, out=args.out,
+               market=args.market, include_local=args.include_local)
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,30 @@
 
 #!/usr/bin/env python3
 import os
+import re
 import sys
-import subprocess
-from pathlib import Path
 
-HERE = Path(__file__).resolve().parent
+from export_playlist_to_csv import run_export
+from make_bingo_from_csv import run_bingo
 
-EXPORT_SCRIPT = HERE / "export_playlist_to_csv.py"
-BINGO_SCRIPT = HERE / "make_bingo_from_csv.py"
+# runs of anything other than letters, digits, "-", "_" or "."
+_SANITIZE = re.compile(r"[^\w.-]+")
 
-def require_file(path: Path, desc: str):
-    if not path.exists():
-        print(f"❌ Missing {desc}: {path}")
-        print("   Make sure you've downloaded the project files so this runner can call them.")
-        sys.exit(1)
+def exit_code(e: SystemExit) -> int:
+    # SystemExit("message") means failure, mirroring how the interpreter maps it to a return code
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
 
 def ask(prompt: str, default: str = "") -> str:
     s = input(f"{prompt}{' ['+default+']' if default else ''}: ").strip()
     return s or default
 
 def to_filename(name: str, ext: str) -> str:
-    base = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name.strip())
-    base = base.strip("_") or "output"
+    base = _SANITIZE.sub("_", name.strip()).strip("_") or "output"
     if not base.lower().endswith(f".{ext.lower()}"):
         base += f".{ext}"
     return base
@@ -30,8 +32,6 @@ def to_filename(name: str, ext: str) -> str:
 def main():
     print("🎵 Spotify Playlist → Music Bingo (PDF)")
     print("=================================================")
-    require_file(EXPORT_SCRIPT, "export script")
-    require_file(BINGO_SCRIPT, "bingo script")
 
     # --- Ask for playlist and export CSV
     playlist_name = ask("Enter the name of the Spotify playlist you want to export")
@@ -44,15 +44,15 @@ def main():
 
     print(f"\n▶️  Exporting playlist '{playlist_name}' to {csv_out} ...\n")
     try:
-        subprocess.run([
-            sys.executable, str(EXPORT_SCRIPT),
-            "--name", playlist_name,
-            "--out", csv_out,
-            "--market", market
-        ], check=True)
-    except subprocess.CalledProcessError as e:
-        print("\n❌ Export failed. Please check your Spotify credentials and scopes.")
-        sys.exit(e.returncode)
+        run_export(name=playlist_name, out=csv_out, market=market)
+    except SystemExit as e:
+        code = exit_code(e)
+        if code:
+            print("\n❌ Export failed. Please check your Spotify credentials and scopes.")
+            sys.exit(code)
+    except Exception as e:
+        print(f"\n❌ Export failed ({e}). Please check your Spotify credentials and scopes.")
+        sys.exit(1)
 
     print(f"\n✅ Export complete: {csv_out}")
 
@@ -72,26 +72,18 @@ def main():
 
     pdf_out = "quiz_pdfs/" + to_filename(f"{playlist_name.replace(' ', '_')}_bingo", "pdf")
 
-    # --- Build bingo command
-    cmd = [
-        sys.executable, str(BINGO_SCRIPT),
-        "--csv", csv_out,
-        "--n", str(n_cards),
-        "--out", pdf_out
-    ]
-    if title:
-        cmd += ["--title", title]
-    if subtitle:
-        cmd += ["--subtitle", subtitle]
-    if no_repeat_across:
-        cmd += ["--no-repeat-across"]
-
     print(f"\n🖨️  Generating bingo PDF: {pdf_out} ...\n")
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print("\n❌ Bingo generation failed. Ensure matplotlib is installed and CSV has 'title' and 'artists' columns.")
-        sys.exit(e.returncode)
+        run_bingo(csv_path=csv_out, n=n_cards, out=pdf_out, title=title or None,
+                  subtitle=subtitle or None, no_repeat_across=no_repeat_across)
+    except SystemExit as e:
+        code = exit_code(e)
+        if code:
+            print("\n❌ Bingo generation failed. Ensure reportlab is installed and CSV has 'title' and 'artists' columns.")
+            sys.exit(code)
+    except Exception as e:
+        print(f"\n❌ Bingo generation failed ({e}). Ensure reportlab is installed and CSV has 'title' and 'artists' columns.")
+        sys.exit(1)
 
     print(f"\n✅ All done!\n- CSV: {csv_out}\n- Bingo PDF: {pdf_out}\n")
 
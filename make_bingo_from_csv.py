@@ -21,13 +21,18 @@ Options:
 
 import argparse
 import csv
+import functools
 import random
 import sys
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import textwrap
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+if TYPE_CHECKING:
+    # reportlab is imported inside run_bingo so --help and bad input fail fast
+    from reportlab.pdfgen import canvas
+
+PAGE_W, PAGE_H = 612.0, 792.0  # US letter in points; layout below is in fractions of the page
+FONT = "Helvetica"
 
 def read_songs(csv_path: str) -> List[Tuple[str, str]]:
     songs = []
@@ -53,52 +58,110 @@ def read_songs(csv_path: str) -> List[Tuple[str, str]]:
             seen.add(key)
     return uniq
 
-def pick_card_songs(pool: List[Tuple[str,str]], k: int, used: set, no_repeat_across: bool) -> List[Tuple[str,str]]:
-    available = [s for s in pool if (not no_repeat_across) or (s not in used)]
-    if len(available) >= k:
-        picks = random.sample(available, k)
+def pick_card_songs(rng: random.Random, pool: List[Tuple[str,str]], k: int, remaining: List[Tuple[str,str]],
+                    no_repeat_across: bool) -> List[Tuple[str,str]]:
+    """
+    Pick k songs for one card. In no-repeat mode, picks are removed from `remaining`
+    so later cards only draw from songs not yet used.
+    """
+    if not no_repeat_across:
+        return rng.sample(pool, k)
+    if len(remaining) >= k:
+        idxs = rng.sample(range(len(remaining)), k)
+        picks = [remaining[i] for i in idxs]
+        # swap-remove from the back so earlier indices stay valid
+        for i in sorted(idxs, reverse=True):
+            remaining[i] = remaining[-1]
+            remaining.pop()
     else:
         # Not enough unique; fill with random choices from full pool (may repeat across cards)
-        picks = available[:] + random.sample(pool, k - len(available))
-    if no_repeat_across:
-        for s in picks:
-            used.add(s)
+        picks = remaining[:] + rng.sample(pool, k - len(remaining))
+        remaining.clear()
     return picks
 
-def wrap_label(text: str, width: int = 18) -> str:
-    lines = textwrap.wrap(text, width=width)
-    return "\n".join(lines)
+_WRAPPER = textwrap.TextWrapper(width=18)
+
+@functools.lru_cache(maxsize=4096)
+def wrap_label(text: str) -> Tuple[str, ...]:
+    # Cells repeat across cards, so wrap each distinct label once
+    return tuple(_WRAPPER.wrap(text))
 
-def draw_card(fig, items: List[str]):
-    # fig.clf() -- clears figure
+def draw_centred_lines(c: "canvas.Canvas", x: float, y: float, lines: Tuple[str, ...], size: float):
+    """Draw lines centred horizontally on x and vertically on y (page fractions)."""
+    leading = size * 1.2
+    c.setFont(FONT, size)
+    # baseline of the first line, nudged down so the block's visual middle sits on y
+    baseline = y * PAGE_H + (len(lines) - 1) * leading / 2 - size * 0.35
+    for i, line in enumerate(lines):
+        c.drawCentredString(x * PAGE_W, baseline - i * leading, line)
+
+def draw_card(c: "canvas.Canvas", items: List[str]):
     # Title and margin layout
     LEFT = 0.05
     RIGHT = 0.95
     TOP = 0.88
     BOTTOM = 0.06
 
-    ax = fig.add_axes([0,0,1,1])
-    ax.axis("off")
-
     # Draw 4x4 grid
     rows, cols = 4, 4
     cell_w = (RIGHT - LEFT) / cols
     cell_h = (TOP - BOTTOM) / rows
 
+    c.setLineWidth(1.5)
     for r in range(rows):
-        for c in range(cols):
-            x0 = LEFT + c * cell_w
+        for col in range(cols):
+            x0 = LEFT + col * cell_w
             y0 = TOP - (r + 1) * cell_h
             # Rectangle
-            rect = plt.Rectangle((x0, y0), cell_w, cell_h, fill=False, linewidth=1.5)
-            ax.add_patch(rect)
+            c.rect(x0 * PAGE_W, y0 * PAGE_H, cell_w * PAGE_W, cell_h * PAGE_H, stroke=1, fill=0)
             # Text
-            idx = r * cols + c
+            idx = r * cols + col
             label = items[idx]
-            ax.text(x0 + cell_w/2, y0 + cell_h/2, wrap_label(label, width=18),
-                    ha='center', va='center', fontsize=9)
+            draw_centred_lines(c, x0 + cell_w/2, y0 + cell_h/2, wrap_label(label), 9)
+
+def run_bingo(csv_path: str, n: int, out: str = "bingo_cards.pdf", title: Optional[str] = None,
+              subtitle: Optional[str] = None, seed: Optional[int] = None, no_repeat_across: bool = False,
+              allow_short: int = 16) -> int:
+    """
+    Write n bingo cards built from the songs in csv_path to out. Returns the number of cards written.
+    """
+    rng = random.Random(seed)
+
+    songs = read_songs(csv_path)
+    if len(songs) < 16 and no_repeat_across:
+        print("Not enough unique songs for one 4x4 card without repeats. Consider removing --no-repeat-across or adding more songs.", file=sys.stderr)
+
+    no_repeat = no_repeat_across and len(songs) >= allow_short
+    remaining = list(songs)
+
+    from reportlab.pdfgen import canvas
+
+    # pages are a few KB of vector ops; skipping zlib is cheaper than the bytes it saves
+    c = canvas.Canvas(out, pagesize=(PAGE_W, PAGE_H), pageCompression=0)
+    for card_idx in range(n):
+        picks = pick_card_songs(rng, songs, 16, remaining, no_repeat)
+        labels = [f"{t} — {a}" for (t,a) in picks]
 
-def main():
+        # Header text
+        y = 0.95
+        if title:
+            draw_centred_lines(c, 0.5, y, (title,), 16)
+            y -= 0.03
+        draw_centred_lines(c, 0.5, y, (f"Bingo Card #{card_idx+1}",), 12)
+        if subtitle:
+            y -= 0.03
+            draw_centred_lines(c, 0.5, y, (subtitle,), 10)
+
+        # Grid
+        draw_card(c, labels)
+
+        c.showPage()
+    c.save()
+
+    print(f"Wrote {n} bingo cards to {out}")
+    return n
+
+def parse_args(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", required=True, help="Input CSV with 'title' and 'artists' columns")
     ap.add_argument("--n", type=int, required=True, help="Number of bingo cards to generate")
@@ -108,39 +171,12 @@ def main():
     ap.add_argument("--allow-short", type=int, default=16, help="If unique pool < this, allow repeats across cards (default 16)")
     ap.add_argument("--title", default=None, help="Optional title to print on each card")
     ap.add_argument("--subtitle", default=None, help="Optional subtitle to print on each card")
-    args = ap.parse_args()
-
-    if args.seed is not None:
-        random.seed(args.seed)
-
-    songs = read_songs(args.csv)
-    if len(songs) < 16 and args.no_repeat_across:
-        print("Not enough unique songs for one 4x4 card without repeats. Consider removing --no-repeat-across or adding more songs.", file=sys.stderr)
+    return ap.parse_args(argv)
 
-    used = set()
-    with PdfPages(args.out) as pdf:
-        for card_idx in range(args.n):
-            picks = pick_card_songs(songs, 16, used, args.no_repeat_across and len(songs) >= args.allow_short)
-            labels = [f"{t} — {a}" for (t,a) in picks]
-
-            fig = plt.figure(figsize=(8.5, 11))  # A4-ish portrait
-            # Header text
-            y = 0.95
-            if args.title:
-                fig.text(0.5, y, args.title, ha='center', va='center', fontsize=16)
-                y -= 0.03
-            fig.text(0.5, y, f"Bingo Card #{card_idx+1}", ha='center', va='center', fontsize=12)
-            if args.subtitle:
-                y -= 0.03
-                fig.text(0.5, y, args.subtitle, ha='center', va='center', fontsize=10)
-
-            # Grid
-            draw_card(fig, labels)
-
-            pdf.savefig(fig)
-            plt.close(fig)
-
-    print(f"Wrote {args.n} bingo cards to {args.out}")
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    run_bingo(csv_path=args.csv, n=args.n, out=args.out, title=args.title, subtitle=args.subtitle,
+              seed=args.seed, no_repeat_across=args.no_repeat_across, allow_short=args.allow_short)
 
 if __name__ == "__main__":
     main()